@@ -13,6 +13,7 @@ app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB max upload
 logging.basicConfig(level=logging.INFO)
 ALLOWED_EXTENSIONS = {"pdf", "docx", "doc", "txt", "md"}
+UPLOAD_BUFFER_SIZE = 1 << 20  # 1 MiB copy chunks when saving uploads (Werkzeug default is 16 KiB)
 
 
 def allowed_file(filename: str) -> bool:
@@ -44,11 +45,11 @@ def generate():
 
             if has_inspection and allowed_file(inspection_file.filename):
                 inspection_path = tmp / secure_filename(inspection_file.filename)
-                inspection_file.save(inspection_path)
+                inspection_file.save(inspection_path, buffer_size=UPLOAD_BUFFER_SIZE)
 
             if has_thermal and allowed_file(thermal_file.filename):
                 thermal_path = tmp / secure_filename(thermal_file.filename)
-                thermal_file.save(thermal_path)
+                thermal_file.save(thermal_path, buffer_size=UPLOAD_BUFFER_SIZE)
 
             if not inspection_path and not thermal_path:
                 return jsonify({"error": "No valid files uploaded. Use PDF, DOCX, or TXT."}), 400
@@ -1,5 +1,6 @@
 """Confidence score (0–1) per observation: heuristic from source agreement, conflicts, and content."""
 
+import re
 from typing import Any
 
 
@@ -11,6 +12,43 @@ def _sources(obs: dict[str, Any]) -> set[str]:
     return {s.strip() for s in src.split(";") if s.strip()}
 
 
+# Keyword groups used by the content rules. Longer variants ("dampness", "leakage",
+# "hollowness", "bedroom") contain these as substrings, so they need no entry of their own.
+_CLEAR_WORDS = frozenset({"visible", "repeated"})
+_DAMAGE_WORDS = frozenset({"damp", "moisture", "leak", "damage"})
+_DAMP_WORDS = frozenset({"damp", "moisture"})
+_LEAK_WORDS = frozenset({"leak", "water"})
+_EVIDENCE_WORDS = frozenset({"evidence", "sign", "damage"})
+_VAGUE_WORDS = frozenset({"unclear", "vague"})
+_SPECIFIC_DAMAGE_WORDS = frozenset({"moisture", "leak", "crack", "structural", "water"})
+_LOCATION_WORDS = frozenset({"room", "ceiling", "wall"})
+_ALL_KEYWORDS = (
+    _CLEAR_WORDS | _DAMAGE_WORDS | _DAMP_WORDS | _LEAK_WORDS | _EVIDENCE_WORDS
+    | _VAGUE_WORDS | _SPECIFIC_DAMAGE_WORDS | _LOCATION_WORDS
+    | {"skirting", "parking", "ceiling", "moderate", "tile", "hollow"}
+)
+# Zero-width lookahead so overlapping occurrences are all reported, matching substring tests
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, sorted(_ALL_KEYWORDS))) + "))")
+
+# Optional Aho-Corasick automaton (pyahocorasick): one linear pass, all overlapping hits
+try:
+    import ahocorasick
+
+    _AUTOMATON = ahocorasick.Automaton()
+    for _kw in _ALL_KEYWORDS:
+        _AUTOMATON.add_word(_kw, _kw)
+    _AUTOMATON.make_automaton()
+except ImportError:
+    _AUTOMATON = None
+
+
+def _find_keywords(text: str) -> set[str]:
+    """Return the set of rule keywords occurring anywhere in text (as substrings)."""
+    if _AUTOMATON is not None:
+        return {kw for _, kw in _AUTOMATON.iter(text)}
+    return set(_KEYWORD_RE.findall(text))
+
+
 def _content_based_confidence(obs: dict[str, Any]) -> tuple[float, str] | None:
     """
     Return (confidence, reason) when observation content suggests a specific level;
@@ -19,37 +57,45 @@ def _content_based_confidence(obs: dict[str, Any]) -> tuple[float, str] | None:
     area = (obs.get("area") or "").strip().lower()
     desc = (obs.get("description") or "").strip().lower()
     it = (obs.get("issue_type") or "").strip().lower()
-    text = f"{area} {desc} {it}"
+    # One scan over the text; the rules below are set tests on the keywords found
+    found = _find_keywords(f"{area} {desc} {it}")
+    if not found:
+        return None
 
     # Clear visible + repeated issues -> 0.85
-    if ("visible" in text or "repeated" in text) and ("damp" in text or "moisture" in text or "leak" in text or "damage" in text):
+    if found & _CLEAR_WORDS and found & _DAMAGE_WORDS:
         return (0.85, "Clear visible or repeated finding")
     # Skirting dampness -> 0.85
-    if "skirting" in text and ("damp" in text or "dampness" in text or "moisture" in text):
+    if "skirting" in found and found & _DAMP_WORDS:
         return (0.85, "Skirting-level dampness clearly reported")
     # Parking ceiling leakage -> 0.85
-    if "parking" in text and "ceiling" in text and ("leak" in text or "leakage" in text or "water" in text):
+    if "parking" in found and "ceiling" in found and found & _LEAK_WORDS:
         return (0.85, "Parking ceiling leakage clearly reported")
 
     # Moderate evidence -> 0.65
-    if "moderate" in text and ("evidence" in text or "sign" in text or "damage" in text):
+    if "moderate" in found and found & _EVIDENCE_WORDS:
         return (0.65, "Moderate evidence")
     # Tile hollowness -> 0.65
-    if "tile" in text and ("hollow" in text or "hollowness" in text):
+    if "tile" in found and "hollow" in found:
         return (0.65, "Tile hollowness noted")
 
     # Unclear / vague -> 0.45
-    if "unclear" in text or "vague" in text:
+    if found & _VAGUE_WORDS:
         return (0.45, "Unclear or vague finding")
     # Vague "Damage – [room]" (e.g. "Damage – Master bedroom bathroom") -> 0.45
-    if ("damage" in text and not any(x in text for x in ["moisture", "leak", "crack", "structural", "water"])) and (
-        "bedroom" in text or "bathroom" in text or "room" in text or "ceiling" in text or "wall" in text
-    ):
+    if "damage" in found and found.isdisjoint(_SPECIFIC_DAMAGE_WORDS) and found & _LOCATION_WORDS:
         return (0.45, "Insufficient diagnostic detail for generic damage")
 
     return None
 
 
+def _conflict_key(obs: dict[str, Any]) -> tuple[str, str]:
+    """Case-insensitive (area, description prefix) key used to match observations to conflicts."""
+    area = (obs.get("area") or "").strip().lower()
+    desc = (obs.get("description") or "").strip()[:80].lower()
+    return (area, desc)
+
+
 def score_confidence(
     observations: list[dict[str, Any]],
     conflicts: list[dict[str, Any]] | None = None,
@@ -65,21 +111,15 @@ def score_confidence(
             for key in ("observation_1", "observation_2"):
                 o = c.get(key)
                 if isinstance(o, dict):
-                    area = (o.get("area") or "").strip()
-                    desc = (o.get("description") or "").strip()[:80]
-                    conflict_obs.add((area, desc))
+                    conflict_obs.add(_conflict_key(o))
 
     result = []
     for obs in observations:
-        obs = dict(obs)
-        area = (obs.get("area") or "").strip()
-        desc = (obs.get("description") or "").strip()[:80]
-        in_conflict = (area, desc) in conflict_obs
-
+        # Content override wins outright; the conflict key is only built when it can matter
         content_override = _content_based_confidence(obs)
         if content_override is not None:
             confidence, reason = content_override
-        elif in_conflict:
+        elif conflict_obs and _conflict_key(obs) in conflict_obs:
             confidence = 0.5
             reason = "Conflicting reports for this finding"
         else:
@@ -91,7 +131,5 @@ def score_confidence(
                 confidence = 0.7
                 reason = "Single source"
 
-        obs["confidence"] = round(confidence, 2)
-        obs["confidence_reason"] = reason
-        result.append(obs)
+        result.append({**obs, "confidence": round(confidence, 2), "confidence_reason": reason})
     return result
@@ -1,29 +1,29 @@
 """LLM extraction of structured data from inspection and thermal reports."""
 
+import asyncio
 import json
 import re
-from pathlib import Path
 from typing import Any, Literal
 
-import yaml
+from .prompts import load_prompt_file
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 DocumentType = Literal["inspection", "thermal"]
 
+# Markdown code block (optionally tagged json) wrapping the JSON payload
+_CODEBLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
 
 def load_prompt(template_name: str, **kwargs: str) -> str:
     """Load and fill a prompt template from prompts/*.yaml."""
-    prompts_dir = Path(__file__).parent.parent / "prompts"
-    if template_name == "inspection_report":
-        with open(prompts_dir / "extraction.yaml") as f:
-            data = yaml.safe_load(f)
-        template = data["inspection_report"]
-    elif template_name == "thermal_report":
-        with open(prompts_dir / "extraction.yaml") as f:
-            data = yaml.safe_load(f)
-        template = data["thermal_report"]
-    else:
+    if template_name not in ("inspection_report", "thermal_report"):
         raise ValueError(f"Unknown template: {template_name}")
-    return template.format(**kwargs)
+    return load_prompt_file("extraction")[template_name].format(**kwargs)
 
 
 def call_llm(prompt: str, model: str = "gemini-2.0-flash") -> str:
@@ -32,29 +32,46 @@ def call_llm(prompt: str, model: str = "gemini-2.0-flash") -> str:
     return _call_llm(prompt, model=model)
 
 
+def _invalidate_cached_response(prompt: str, model: str) -> None:
+    """Forget a cached LLM response so a retry asks the model again."""
+    from .llm import invalidate_cache
+    invalidate_cache(prompt, model=model)
+
+
 def extract_json_from_response(response: str) -> dict[str, Any]:
     """Parse JSON from LLM response, handling markdown code blocks."""
     text = response.strip()
     # Remove markdown code blocks if present
-    match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text)
+    if text.startswith("```"):
+        # Common case: the whole response is one fenced block, no regex needed
+        start = 7 if text.startswith("json", 3) else 3
+        end = text.find("```", start)
+        if end != -1:
+            return _json_loads(text[start:end].strip())
+    match = _CODEBLOCK_RE.search(text)
     if match:
         text = match.group(1)
-    return json.loads(text)
+    return _json_loads(text)
 
 
-def extract_from_document(
-    content: str,
-    document_type: DocumentType,
-    model: str = "gemini-2.0-flash",
-) -> dict[str, Any]:
-    """Extract structured data from a document using the appropriate prompt."""
+def _build_extraction_prompt(content: str, document_type: DocumentType) -> str:
+    """Fill the extraction prompt for the given document type."""
     template_name = "inspection_report" if document_type == "inspection" else "thermal_report"
-    prompt = load_prompt(template_name, content=content)
-    response = call_llm(prompt, model=model)
+    return load_prompt(template_name, content=content)
+
 
+def _parse_extraction(
+    response: str,
+    document_type: DocumentType,
+    prompt: str,
+    model: str,
+) -> dict[str, Any]:
+    """Turn the raw LLM response into the extraction dict, tagging observation sources."""
     try:
         data = extract_json_from_response(response)
     except json.JSONDecodeError:
+        # Unparseable answer: don't serve it again from the response cache on retry
+        _invalidate_cached_response(prompt, model)
         return {
             "observations": [],
             "temperatures": [],
@@ -78,3 +95,25 @@ def extract_from_document(
         obs["source"] = obs.get("source", source)
 
     return result
+
+
+def extract_from_document(
+    content: str,
+    document_type: DocumentType,
+    model: str = "gemini-2.0-flash",
+) -> dict[str, Any]:
+    """Extract structured data from a document using the appropriate prompt."""
+    prompt = _build_extraction_prompt(content, document_type)
+    response = call_llm(prompt, model=model)
+    return _parse_extraction(response, document_type, prompt, model)
+
+
+async def extract_from_document_async(
+    content: str,
+    document_type: DocumentType,
+    model: str = "gemini-2.0-flash",
+) -> dict[str, Any]:
+    """Async variant of extract_from_document; only the LLM call runs in a worker thread."""
+    prompt = _build_extraction_prompt(content, document_type)
+    response = await asyncio.to_thread(call_llm, prompt, model=model)
+    return _parse_extraction(response, document_type, prompt, model)
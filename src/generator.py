@@ -1,19 +1,34 @@
 """DDR generation from merged data."""
 
+import html
 import json
-from pathlib import Path
+import re
+from collections.abc import Iterator
 from typing import Any
 
-import yaml
+from .prompts import load_prompt_file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# "## Heading" lines that start report sections
+_SECTION_RE = re.compile(r"^## (.*)$", re.MULTILINE)
+# Line boundaries str.splitlines() honors besides "\n"
+_OTHER_LINE_BREAK_RE = re.compile(r"[\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON with orjson when installed, else the stdlib (str() for unknown types)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, default=str, indent=2 if indent else None)
 
 
 def load_generation_prompt(**kwargs: str) -> str:
     """Load and fill the DDR generation prompt."""
-    prompts_dir = Path(__file__).parent.parent / "prompts"
-    with open(prompts_dir / "generation.yaml") as f:
-        data = yaml.safe_load(f)
-    template = data["ddr_generation"]
-    return template.format(**kwargs)
+    return load_prompt_file("generation")["ddr_generation"].format(**kwargs)
 
 
 def call_llm(prompt: str, model: str = "gemini-2.0-flash") -> str:
@@ -28,33 +43,35 @@ def _format_merged_for_prompt(merged: dict[str, Any]) -> str:
     if merged.get("observations"):
         parts.append("Observations (with cluster, urgency, root cause, confidence):")
         for o in merged["observations"]:
-            area = o.get("area", "Unknown")
-            desc = o.get("description", "")
-            src = o.get("source", "")
-            cluster = o.get("cluster_id", "")
-            cluster_label = o.get("cluster_label", "")
-            urgency = o.get("urgency_score", "")
-            urgency_reason = o.get("urgency_reason", "")
-            root_cause = o.get("root_cause", "")
-            evidence = o.get("evidence", [])
-            confidence = o.get("confidence", "")
-            confidence_reason = o.get("confidence_reason", "")
-            line = f"  - [{area}] ({src}): {desc}"
+            get = o.get
+            area = get("area", "Unknown")
+            desc = get("description", "")
+            src = get("source", "")
+            cluster = get("cluster_id", "")
+            cluster_label = get("cluster_label", "")
+            urgency = get("urgency_score", "")
+            urgency_reason = get("urgency_reason", "")
+            root_cause = get("root_cause", "")
+            evidence = get("evidence", [])
+            confidence = get("confidence", "")
+            confidence_reason = get("confidence_reason", "")
+            segs = [f"  - [{area}] ({src}): {desc}"]
+            append = segs.append
             if cluster:
-                line += f" | Cluster: {cluster_label or cluster}"
+                append(f" | Cluster: {cluster_label or cluster}")
             if urgency:
-                line += f" | Urgency: {urgency}/5"
+                append(f" | Urgency: {urgency}/5")
             if urgency_reason:
-                line += f" ({urgency_reason})"
+                append(f" ({urgency_reason})")
             if root_cause:
-                line += f" | Root cause: {root_cause}"
+                append(f" | Root cause: {root_cause}")
             if evidence:
-                line += f" | Evidence: {'; '.join(evidence)}"
+                append(f" | Evidence: {'; '.join(evidence)}")
             if confidence != "":
-                line += f" | Confidence: {confidence}"
+                append(f" | Confidence: {confidence}")
             if confidence_reason:
-                line += f" ({confidence_reason})"
-            parts.append(line)
+                append(f" ({confidence_reason})")
+            parts.append("".join(segs))
     if merged.get("temperatures"):
         parts.append("Temperature readings (raw):")
         for t in merged["temperatures"]:
@@ -91,7 +108,7 @@ def _format_conflicts_for_prompt(conflicts: list[dict[str, Any]]) -> str:
         parts.append(f"- {msg}")
         for k in ("observation_1", "observation_2"):
             if k in c:
-                parts.append(f"  {k}: {json.dumps(c[k], default=str)}")
+                parts.append(f"  {k}: {_json_dumps(c[k])}")
     return "\n".join(parts)
 
 
@@ -114,39 +131,45 @@ def generate_ddr(
     return call_llm(prompt, model=model)
 
 
+def _split_sections(report_md: str) -> dict[str, str]:
+    """Map each "## " heading to the text up to the next heading (text before the first is dropped)."""
+    if _OTHER_LINE_BREAK_RE.search(report_md):
+        # Split lines the way splitlines() does (CRLF, lone CR, ...) before matching headings
+        report_md = "\n".join(report_md.splitlines())
+    sections = {}
+    headings = list(_SECTION_RE.finditer(report_md))
+    for m, nxt in zip(headings, headings[1:] + [None]):
+        title = m.group(1).strip()
+        if title:
+            end = nxt.start() if nxt else len(report_md)
+            sections[title] = report_md[m.end():end].strip()
+    return sections
+
+
+def _iter_html_lines(report_md: str) -> Iterator[str]:
+    """Yield one HTML line per markdown line (## headings, - bullets, paragraphs, blanks)."""
+    escape = html.escape
+    for line in report_md.splitlines():
+        # Dispatch on the first character so most lines skip the prefix checks
+        first = line[:1]
+        if first == "#" and line.startswith("## "):
+            yield f"<h2>{escape(line[3:].strip())}</h2>"
+        elif first == "-" and line.startswith("- "):
+            yield f"<li>{escape(line[2:])}</li>"
+        elif line.strip():
+            yield f"<p>{escape(line)}</p>"
+        else:
+            yield "<br/>"
+
+
 def format_output(report_md: str, output_format: str) -> str:
     """Convert report to requested format (markdown, json, html)."""
     if output_format == "markdown":
         return report_md
     if output_format == "json":
-        # Parse markdown sections into JSON-like structure
-        sections = {}
-        current = None
-        buf = []
-        for line in report_md.splitlines():
-            if line.startswith("## "):
-                if current:
-                    sections[current] = "\n".join(buf).strip()
-                current = line[3:].strip()
-                buf = []
-            else:
-                buf.append(line)
-        if current:
-            sections[current] = "\n".join(buf).strip()
-        return json.dumps(sections, indent=2)
+        return _json_dumps(_split_sections(report_md), indent=True)
     if output_format == "html":
-        import html
-        lines = []
-        for line in report_md.splitlines():
-            if line.startswith("## "):
-                lines.append(f"<h2>{html.escape(line[3:].strip())}</h2>")
-            elif line.startswith("- "):
-                lines.append(f"<li>{html.escape(line[2:])}</li>")
-            elif line.strip():
-                lines.append(f"<p>{html.escape(line)}</p>")
-            else:
-                lines.append("<br/>")
-        body = "\n".join(lines)
+        body = "\n".join(_iter_html_lines(report_md))
         return f"""<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"><title>Detailed Diagnostic Report</title></head>
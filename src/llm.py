@@ -1,7 +1,78 @@
 """LLM client using Google Gemini API (free tier)."""
 
+import hashlib
 import os
+import threading
 import time
+from collections import OrderedDict
+from typing import Any
+
+# Exact-match response cache: identical (model, prompt) pairs reuse the earlier answer
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SEC = 300.0
+
+_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(model: str, prompt: str) -> str:
+    """Digest of (model, prompt), so the cache does not hold on to whole prompts."""
+    return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+    """Return a cached response if present and not expired (refreshes LRU position)."""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > CACHE_TTL_SEC:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return response
+
+
+def _cache_put(key: str, response: str) -> None:
+    """Store a response, dropping expired entries and the least recently used ones beyond the size cap."""
+    now = time.monotonic()
+    with _cache_lock:
+        expired = [k for k, (stored_at, _) in _cache.items() if now - stored_at > CACHE_TTL_SEC]
+        for k in expired:
+            del _cache[k]
+        _cache[key] = (now, response)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def invalidate_cache(prompt: str, model: str = "gemini-2.0-flash") -> None:
+    """Drop the cached response for (model, prompt), e.g. after it turned out to be unusable."""
+    with _cache_lock:
+        _cache.pop(_cache_key(model, prompt), None)
+
+
+def clear_cache() -> None:
+    """Drop all cached LLM responses."""
+    with _cache_lock:
+        _cache.clear()
+
+
+# One Gemini client per API key, reused so its HTTP connection pool survives across calls
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(api_key: str) -> Any:
+    """Return the shared genai.Client for this API key, creating it on first use."""
+    from google import genai
+
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = genai.Client(api_key=api_key)
+        return client
 
 
 def _is_quota_error(exc: BaseException) -> bool:
@@ -15,21 +86,44 @@ def _is_quota_error(exc: BaseException) -> bool:
     )
 
 
-def call_llm(prompt: str, model: str = "gemini-2.0-flash") -> str:
-    """Call Gemini API. Set GOOGLE_API_KEY or GEMINI_API_KEY in environment."""
+def _response_text(response) -> str:
+    """Extract the text of a generate_content response ("" if none)."""
+    try:
+        if hasattr(response, "text") and response.text:
+            return response.text
+    except (ValueError, AttributeError):
+        pass
+    if response.candidates:
+        cand = response.candidates[0]
+        if cand.content and cand.content.parts:
+            part = cand.content.parts[0]
+            if hasattr(part, "text") and part.text:
+                return part.text
+    return ""
+
+
+def call_llm(prompt: str, model: str = "gemini-2.0-flash", cache: bool = True) -> str:
+    """
+    Call Gemini API. Set GOOGLE_API_KEY or GEMINI_API_KEY in environment.
+    Non-empty responses are cached per (model, prompt) for CACHE_TTL_SEC; pass cache=False to bypass.
+    """
     raw = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     api_key = (raw or "").strip()
     if not api_key or api_key.lower() in ("your-api-key-here", "your_api_key_here", ""):
         raise RuntimeError(
             "API key required. Set GOOGLE_API_KEY in .env with a key from https://aistudio.google.com/apikey"
         )
+    cache_key = _cache_key(model, prompt)
+    if cache:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
     try:
-        from google import genai
         from google.genai import types
     except ImportError:
         raise RuntimeError("google-genai package required. Install with: pip install google-genai")
 
-    client = genai.Client(api_key=api_key)
+    client = _get_client(api_key)
     max_retries = 2
     retry_delay_sec = 65  # free tier is often per-minute; wait just over 1 min
 
@@ -42,18 +136,10 @@ def call_llm(prompt: str, model: str = "gemini-2.0-flash") -> str:
                     temperature=0.2,
                 ),
             )
-            try:
-                if hasattr(response, "text") and response.text:
-                    return response.text
-            except (ValueError, AttributeError):
-                pass
-            if response.candidates:
-                cand = response.candidates[0]
-                if cand.content and cand.content.parts:
-                    part = cand.content.parts[0]
-                    if hasattr(part, "text") and part.text:
-                        return part.text
-            return ""
+            text = _response_text(response)
+            if cache and text:
+                _cache_put(cache_key, text)
+            return text
         except Exception as e:
             if _is_quota_error(e) and attempt < max_retries:
                 time.sleep(retry_delay_sec)
@@ -10,22 +10,44 @@ def normalize_area(area: str) -> str:
     return str(area).strip().lower()
 
 
+def _similarity_text(obs: dict) -> str:
+    """Lowercased issue_type (or description prefix) used to compare observations."""
+    return (obs.get("issue_type") or obs.get("description", ""))[:50].lower()
+
+
+def _words_overlap(words1: frozenset[str], words2: frozenset[str]) -> bool:
+    """True if more than 30% of the larger word set is shared."""
+    if not words1 or not words2:
+        return False
+    return len(words1 & words2) / max(len(words1), len(words2)) > 0.3
+
+
+def _texts_similar(t1: str, words1: frozenset[str], t2: str, words2: frozenset[str]) -> bool:
+    """Similarity of two same-area observations given their texts and pre-split words."""
+    # Missing text on either side: same area is enough; containment (incl. equality) is cheap
+    if not t1 or not t2 or t1 in t2 or t2 in t1:
+        return True
+    # Check for keyword overlap
+    return _words_overlap(words1, words2)
+
+
 def observations_similar(obs1: dict, obs2: dict) -> bool:
     """Check if two observations are semantically similar (same area + same issue type)."""
     a1 = normalize_area(obs1.get("area", ""))
     a2 = normalize_area(obs2.get("area", ""))
     if a1 != a2:
         return False
-    t1 = (obs1.get("issue_type") or obs1.get("description", ""))[:50].lower()
-    t2 = (obs2.get("issue_type") or obs2.get("description", ""))[:50].lower()
-    # Simple overlap check: same area and similar description/type
-    if not t1 or not t2:
-        return a1 == a2
-    # Check for keyword overlap
-    words1 = set(t1.split())
-    words2 = set(t2.split())
-    overlap = len(words1 & words2) / max(len(words1), len(words2)) if words1 and words2 else 0
-    return overlap > 0.3 or t1 in t2 or t2 in t1
+    t1 = _similarity_text(obs1)
+    t2 = _similarity_text(obs2)
+    if not t1 or not t2 or t1 in t2 or t2 in t1:
+        return True
+    # Only split into word sets when the cheap checks are inconclusive
+    return _words_overlap(frozenset(t1.split()), frozenset(t2.split()))
+
+
+def _split_list(value: str) -> set[str]:
+    """Entries of a "; "-joined field, stripped."""
+    return {part.strip() for part in value.split(";") if part.strip()}
 
 
 def _merge_observations(seen: dict, new: dict) -> None:
@@ -37,16 +59,17 @@ def _merge_observations(seen: dict, new: dict) -> None:
             seen["description"] = f"{desc_seen}. Thermal/Inspection: {desc_new}"
         else:
             seen["description"] = desc_new
+    # issue_type and source accumulate as "a; b" lists; compare whole entries, not substrings
     it_seen = (seen.get("issue_type") or "").strip()
     it_new = (new.get("issue_type") or "").strip()
     if it_new:
-        if it_seen and it_new.lower() != it_seen.lower():
-            seen["issue_type"] = f"{it_seen}; {it_new}"
-        elif not it_seen:
+        if not it_seen:
             seen["issue_type"] = it_new
+        elif it_new.lower() not in _split_list(it_seen.lower()):
+            seen["issue_type"] = f"{it_seen}; {it_new}"
     src_seen = (seen.get("source") or "").strip()
     src_new = (new.get("source") or "").strip()
-    if src_new and src_new not in src_seen:
+    if src_new and src_new not in _split_list(src_seen):
         seen["source"] = f"{src_seen}; {src_new}" if src_seen else src_new
 
 
@@ -56,6 +79,7 @@ def merge_extractions(
 ) -> tuple[dict[str, Any], list[dict[str, Any]], list[str]]:
     """
     Merge extractions from inspection and thermal reports.
+    Observation dicts are taken over (source relabelled, duplicates merged into them), not copied.
     Returns: (merged_data, conflicts, missing_list)
     """
     merged: dict[str, Any] = {
@@ -66,18 +90,23 @@ def merge_extractions(
         "missing": [],
     }
     conflicts: list[dict[str, Any]] = []
-    seen_observations: list[dict] = []
+    # normalized area -> [observation, similarity text, similarity words] for merge candidates
+    area_to_seen: dict[str, list[list[Any]]] = {}
 
     def add_observations(data: dict | None, source_label: str) -> None:
         if not data:
             return
+        # Observations are labelled and merged in place; extraction output is not reused
         for obs in data.get("observations", []):
-            obs = dict(obs)
             obs["source"] = source_label
+            text = _similarity_text(obs)
+            words = frozenset(text.split())
+            # Only observations in the same area can be similar
+            candidates = area_to_seen.setdefault(normalize_area(obs.get("area", "")), [])
             # Check for duplicates: merge similar non-conflicting, record conflicts
-            merged_into = False
-            for seen in seen_observations:
-                if observations_similar(obs, seen):
+            for entry in candidates:
+                seen, seen_text, seen_words = entry
+                if _texts_similar(text, words, seen_text, seen_words):
                     if _has_conflict(obs, seen):
                         conflicts.append({
                             "type": "observation",
@@ -87,10 +116,11 @@ def merge_extractions(
                         })
                     else:
                         _merge_observations(seen, obs)
-                    merged_into = True
+                        entry[1] = _similarity_text(seen)
+                        entry[2] = frozenset(entry[1].split())
                     break
-            if not merged_into:
-                seen_observations.append(obs)
+            else:
+                candidates.append([obs, text, words])
                 merged["observations"].append(obs)
 
     def _has_conflict(a: dict, b: dict) -> bool:
@@ -110,15 +140,14 @@ def merge_extractions(
             for t in data.get("temperatures", []):
                 merged["temperatures"].append(dict(t))
 
-    # Merge severity mentions, check for conflicts
-    severities: list[str] = []
-    for data in (inspection_data, thermal_data):
-        if data:
-            for s in data.get("severity_mentions", []):
-                s = str(s).strip()
-                if s and s not in severities:
-                    severities.append(s)
-    merged["severity_mentions"] = severities
+    # Merge severity mentions (order-preserving dedup)
+    merged["severity_mentions"] = list(dict.fromkeys(
+        s
+        for data in (inspection_data, thermal_data)
+        if data
+        for s in (str(x).strip() for x in data.get("severity_mentions", []))
+        if s
+    ))
 
     # Merge ambiguous and missing
     for data in (inspection_data, thermal_data):
@@ -1,36 +1,130 @@
 """Document parser for PDF, DOCX, and plain text inspection reports."""
 
+import hashlib
+import io
+import os
 import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
+# PDF backends, imported once per process (None when not installed)
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+else:
+    # find_tables() otherwise prints a pymupdf_layout hint to stdout (breaks `main.py -f json > out`)
+    if hasattr(pymupdf, "no_recommend_layout"):
+        pymupdf.no_recommend_layout()
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+try:
+    from PyPDF2 import PdfReader, __version__ as _PYPDF2_VERSION
+except ImportError:
+    PdfReader = None
 
-def parse_pdf(path: Path) -> str:
-    """Extract text from a PDF file. Uses pdfplumber for tables, PyPDF2 as fallback."""
+# Library (and version) parse_pdf uses; part of PDF cache keys so a backend change re-parses
+if pymupdf is not None:
+    _PDF_BACKEND = f"pymupdf-{pymupdf.__version__}"
+elif pdfplumber is not None:
+    _PDF_BACKEND = f"pdfplumber-{pdfplumber.__version__}"
+elif PdfReader is not None:
+    _PDF_BACKEND = f"pypdf2-{_PYPDF2_VERSION}"
+else:
+    _PDF_BACKEND = "none"
+
+# Parsed-text cache (content digest -> normalized text), bounded LRU
+PARSE_CACHE_MAX_ENTRIES = 32
+# Files kept in DDR_PARSER_CACHE_DIR; least recently used ones beyond this are deleted
+PARSE_DISK_CACHE_MAX_ENTRIES = 256
+# Bump when parsing or _normalize_text output changes, so stale cached text is not served
+PARSE_CACHE_VERSION = 1
+# Every file the disk cache creates starts with this, so pruning never touches anything else
+_CACHE_FILE_PREFIX = "ddr-parse-"
+# Temp files older than this are leftovers of interrupted writes
+_STALE_TMP_SEC = 3600.0
+
+_parse_cache: OrderedDict[str, str] = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+_MULTI_NEWLINE = re.compile(r"\n{3,}")
+_MULTI_SPACE = re.compile(r" {2,}")
+
+
+def _finish_blocks(buf: io.StringIO) -> str:
+    """Buffer contents (blocks each followed by a blank line) without the trailing separator."""
+    return buf.getvalue()[:-2]
+
+
+def parse_pdf(path: Path, tables: bool = True) -> str:
+    """
+    Extract text from a PDF file. Uses PyMuPDF (C-backed) and reads tables only on sparse pages;
+    falls back to pdfplumber, then PyPDF2, when PyMuPDF is not installed.
+    Pass tables=False for narrative reports to skip table detection entirely (both the
+    PyMuPDF page.find_tables() and the pdfplumber page.extract_tables() paths honor it).
+    """
+    if pymupdf is None:
+        return _parse_pdf_pdfplumber(path, tables)
+    try:
+        with pymupdf.open(path) as doc:
+            buf = io.StringIO()
+            for page in doc:
+                text = page.get_text("text")
+                if text:
+                    buf.write(text)
+                    buf.write("\n\n")
+                # Try to extract tables if text is sparse
+                if tables and (not text or len(text.strip()) < 100):
+                    for table in page.find_tables().tables:
+                        for row in table.extract():
+                            if row:
+                                buf.write(" | ".join(str(cell or "") for cell in row))
+                                buf.write("\n\n")
+            return _finish_blocks(buf)
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse PDF: {e}") from e
+
+
+def _parse_pdf_pdfplumber(path: Path, tables: bool = True) -> str:
+    """Extract text from a PDF file with pdfplumber (tables on sparse pages), PyPDF2 as fallback."""
+    if pdfplumber is None:
+        return _parse_pdf_pypdf2(path)
     try:
-        import pdfplumber
         with pdfplumber.open(path) as pdf:
-            pages = []
+            buf = io.StringIO()
             for page in pdf.pages:
                 # Extract text
                 text = page.extract_text()
                 if text:
-                    pages.append(text)
-                # Try to extract tables if text is sparse
-                tables = page.extract_tables()
+                    buf.write(text)
+                    buf.write("\n\n")
+                # Try to extract tables if text is sparse (table finding is the costly part,
+                # so dense pages skip it entirely)
                 if tables and (not text or len(text.strip()) < 100):
-                    for table in tables:
+                    for table in page.extract_tables():
                         for row in table:
                             if row:
-                                pages.append(" | ".join(str(cell or "") for cell in row))
-            return "\n\n".join(pages) if pages else ""
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(path)
-            return "\n\n".join(page.extract_text() or "" for page in reader.pages)
-        except Exception as e:
-            raise RuntimeError(f"Failed to parse PDF: {e}") from e
+                                buf.write(" | ".join(str(cell or "") for cell in row))
+                                buf.write("\n\n")
+            return _finish_blocks(buf)
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse PDF: {e}") from e
+
+
+def _parse_pdf_pypdf2(path: Path) -> str:
+    """Extract text from a PDF file with PyPDF2 (no table support)."""
+    if PdfReader is None:
+        raise RuntimeError("Failed to parse PDF: install pymupdf, pdfplumber, or PyPDF2")
+    try:
+        reader = PdfReader(path)
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
     except Exception as e:
         raise RuntimeError(f"Failed to parse PDF: {e}") from e
 
@@ -61,32 +155,147 @@ def parse_docx(path: Path) -> str:
 def parse_txt(path: Path) -> str:
     """Read plain text file."""
     encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
+    data = path.read_bytes()  # read once, try each encoding in memory
     last_error = None
     for enc in encodings:
         try:
-            return path.read_text(encoding=enc)
+            text = data.decode(enc)
         except UnicodeDecodeError as e:
             last_error = e
+            continue
+        # Same newline translation as reading in text mode
+        return text.replace("\r\n", "\n").replace("\r", "\n")
     raise RuntimeError(f"Could not decode text file with any encoding: {last_error}") from last_error
 
 
-def parse_document(path: Path) -> str:
-    """Parse a document (PDF, DOCX, or TXT) and return normalized text."""
+def _cache_key(path: Path, tables: bool = True) -> str:
+    """
+    Cache key from the file's content and type, so re-uploads under a new name still hit.
+    Also covers the cache version and, for PDFs, the backend and tables flag.
+    """
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    suffix = path.suffix.lower()
+    key = f"v{PARSE_CACHE_VERSION}-{digest}{suffix}"
+    if suffix == ".pdf":
+        key += f".{_PDF_BACKEND}" + ("" if tables else ".notables")
+    return key
+
+
+def _cache_dir() -> Path | None:
+    """Directory for the persistent parse cache, if DDR_PARSER_CACHE_DIR is set."""
+    raw = os.environ.get("DDR_PARSER_CACHE_DIR", "").strip()
+    return Path(raw).expanduser() if raw else None
+
+
+def _cache_path(cache_dir: Path, key: str) -> Path:
+    """On-disk location of a cache entry."""
+    return cache_dir / f"{_CACHE_FILE_PREFIX}{key}.txt"
+
+
+def _cache_get(key: str) -> str | None:
+    """Look up parsed text in memory, then on disk (promoting disk hits into memory)."""
+    with _parse_cache_lock:
+        text = _parse_cache.get(key)
+        if text is not None:
+            _parse_cache.move_to_end(key)
+            return text
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    cache_path = _cache_path(cache_dir, key)
+    try:
+        text = cache_path.read_bytes().decode("utf-8")
+        os.utime(cache_path)  # mark as recently used for disk eviction
+    except (OSError, UnicodeDecodeError):
+        return None
+    _cache_put(key, text, persist=False)
+    return text
+
+
+def _cache_put(key: str, text: str, persist: bool = True) -> None:
+    """Store parsed text in memory (LRU) and, when configured, on disk."""
+    with _parse_cache_lock:
+        _parse_cache[key] = text
+        _parse_cache.move_to_end(key)
+        while len(_parse_cache) > PARSE_CACHE_MAX_ENTRIES:
+            _parse_cache.popitem(last=False)
+    cache_dir = _cache_dir()
+    if persist and cache_dir is not None:
+        try:
+            _write_cache_file(cache_dir, key, text)
+            _prune_cache_dir(cache_dir)
+        except OSError:
+            pass  # the cache is best-effort
+
+
+def _write_cache_file(cache_dir: Path, key: str, text: str) -> None:
+    """Write via a temp file and rename, so other processes never read a partial file."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=f".{_CACHE_FILE_PREFIX}{key}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(text.encode("utf-8"))
+        os.replace(tmp_name, _cache_path(cache_dir, key))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _prune_cache_dir(cache_dir: Path) -> None:
+    """
+    Delete the least recently used cache files beyond PARSE_DISK_CACHE_MAX_ENTRIES, plus temp
+    files left by interrupted writes. Only files with the cache's own prefix are considered.
+    """
+    stale_before = time.time() - _STALE_TMP_SEC
+    for tmp_path in cache_dir.glob(f".{_CACHE_FILE_PREFIX}*.tmp"):
+        try:
+            if tmp_path.stat().st_mtime < stale_before:
+                tmp_path.unlink()
+        except OSError:
+            continue  # finished or removed by another process meanwhile
+    entries = []
+    for cache_path in cache_dir.glob(f"{_CACHE_FILE_PREFIX}*.txt"):
+        try:
+            entries.append((cache_path.stat().st_mtime, cache_path))
+        except OSError:
+            continue  # removed by another process meanwhile
+    excess = len(entries) - PARSE_DISK_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    entries.sort()
+    for _, cache_path in entries[:excess]:
+        cache_path.unlink(missing_ok=True)
+
+
+def parse_document(path: Path, tables: bool = True) -> str:
+    """
+    Parse a document (PDF, DOCX, or TXT) and return normalized text.
+    tables=False skips PDF table detection (see parse_pdf); it has no effect on other formats.
+    Results are cached by file content: in memory, and on disk when DDR_PARSER_CACHE_DIR is set.
+    """
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
     suffix = path.suffix.lower()
     if suffix == ".pdf":
-        text = parse_pdf(path)
+        parse = partial(parse_pdf, tables=tables)
     elif suffix in (".docx", ".doc"):
-        text = parse_docx(path)
+        parse = parse_docx
     elif suffix in (".txt", ".md", ""):
-        text = parse_txt(path)
+        parse = parse_txt
     else:
         raise ValueError(f"Unsupported file format: {suffix}. Use PDF, DOCX, or TXT.")
 
-    return _normalize_text(text)
+    key = _cache_key(path, tables)
+    text = _cache_get(key)
+    if text is None:
+        text = _normalize_text(parse(path))
+        _cache_put(key, text)
+    return text
 
 
 def _normalize_text(text: str) -> str:
@@ -94,7 +303,7 @@ def _normalize_text(text: str) -> str:
     if not text or not text.strip():
         return ""
     # Collapse multiple newlines to double newline
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _MULTI_NEWLINE.sub("\n\n", text)
     # Collapse multiple spaces to single
-    text = re.sub(r" {2,}", " ", text)
+    text = _MULTI_SPACE.sub(" ", text)
     return text.strip()
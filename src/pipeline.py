@@ -1,7 +1,8 @@
 """Orchestrates the full DDR generation pipeline."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from .clustering import cluster_observations
 from .confidence import score_confidence
@@ -14,6 +15,42 @@ from .temperature_analysis import compute_temperature_analysis
 from .urgency import score_urgency
 
 
+def _parse_and_extract(
+    path: Path | None,
+    document_type: str,
+    model: str,
+    verbose: bool,
+) -> tuple[str, dict[str, Any] | None]:
+    """Parse one document, then extract it; returns (text, data or None)."""
+    if not path:
+        return "", None
+    try:
+        text = parse_document(Path(path))
+    except Exception as e:
+        if verbose:
+            print(f"Warning: Could not parse {document_type} document: {e}")
+        return "", None
+    if not text:
+        return "", None
+    data = extract_from_document(text, document_type, model=model)
+    if verbose:
+        print(f"{document_type.capitalize()} extraction complete.")
+    return text, data
+
+
+def _parse_and_extract_all(
+    inspection_path: Path | None,
+    thermal_path: Path | None,
+    model: str,
+    verbose: bool,
+) -> tuple[tuple[str, dict[str, Any] | None], tuple[str, dict[str, Any] | None]]:
+    """Run both documents in worker threads, so one is parsed while the other's LLM call is in flight."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        inspection = executor.submit(_parse_and_extract, inspection_path, "inspection", model, verbose)
+        thermal = executor.submit(_parse_and_extract, thermal_path, "thermal", model, verbose)
+        return inspection.result(), thermal.result()
+
+
 def run_pipeline(
     inspection_path: Path | None = None,
     thermal_path: Path | None = None,
@@ -23,40 +60,14 @@ def run_pipeline(
     verbose: bool = False,
 ) -> str:
     """Run the full pipeline and return the generated report."""
-    inspection_text = ""
-    thermal_text = ""
-
-    if inspection_path:
-        try:
-            inspection_text = parse_document(Path(inspection_path))
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not parse inspection document: {e}")
-            inspection_text = ""
-
-    if thermal_path:
-        try:
-            thermal_text = parse_document(Path(thermal_path))
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not parse thermal document: {e}")
-            thermal_text = ""
+    # Parse + extract (both documents at once)
+    (inspection_text, inspection_data), (thermal_text, thermal_data) = _parse_and_extract_all(
+        inspection_path, thermal_path, model, verbose
+    )
 
     if not inspection_text and not thermal_text:
         raise ValueError("At least one valid document (inspection or thermal) is required.")
 
-    # Extract
-    inspection_data = None
-    thermal_data = None
-    if inspection_text:
-        inspection_data = extract_from_document(inspection_text, "inspection", model=model)
-        if verbose:
-            print("Inspection extraction complete.")
-    if thermal_text:
-        thermal_data = extract_from_document(thermal_text, "thermal", model=model)
-        if verbose:
-            print("Thermal extraction complete.")
-
     # Merge
     merged, conflicts, missing_list = merge_extractions(inspection_data, thermal_data)
     if verbose:
@@ -0,0 +1,77 @@
+"""Prompt template loading shared by extraction, generation, and root-cause inference."""
+
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+@lru_cache(maxsize=16)
+def _parse_prompt_file(path: Path, mtime_ns: int) -> dict[str, Any]:
+    """Parse one prompt file; keyed on file mtime so edits reload without a restart."""
+    if path.suffix == ".json":
+        return _json_loads(path.read_bytes())
+    with open(path) as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def load_prompt_file(name: str) -> dict[str, Any]:
+    """
+    Return the parsed prompts/<name>.yaml. A JSON export next to it (<name>.json) is used
+    instead when it is at least as new as the YAML, since JSON parses much faster.
+    """
+    path = PROMPTS_DIR / f"{name}.yaml"
+    mtime_ns = path.stat().st_mtime_ns
+    json_path = path.with_suffix(".json")
+    try:
+        json_mtime_ns = json_path.stat().st_mtime_ns
+    except OSError:
+        json_mtime_ns = -1
+    if json_mtime_ns >= mtime_ns:
+        return _parse_prompt_file(json_path, json_mtime_ns)
+    return _parse_prompt_file(path, mtime_ns)
+
+
+def export_json() -> list[Path]:
+    """Write a JSON export next to every prompts/*.yaml so later loads skip YAML parsing."""
+    written = []
+    for path in sorted(PROMPTS_DIR.glob("*.yaml")):
+        with open(path) as f:
+            data = yaml.load(f, Loader=_SafeLoader)
+        json_path = path.with_suffix(".json")
+        # Temp file + rename: load_prompt_file never sees a half-written export
+        fd, tmp_name = tempfile.mkstemp(dir=PROMPTS_DIR, prefix=f".{json_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+            os.replace(tmp_name, json_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        written.append(json_path)
+    return written
+
+
+if __name__ == "__main__":
+    for exported in export_json():
+        print(f"Wrote {exported}")
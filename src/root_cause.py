@@ -1,11 +1,11 @@
 """Root cause inference: LLM-based root_cause and evidence per observation."""
 
 import json
-import re
-from pathlib import Path
+from itertools import chain
 from typing import Any
 
-import yaml
+from .extractor import extract_json_from_response
+from .prompts import load_prompt_file
 
 
 def _build_summary(
@@ -13,44 +13,35 @@ def _build_summary(
     temperature_analysis: dict[str, Any] | None,
 ) -> str:
     """Build a text summary for the root-cause prompt."""
-    lines = []
-    for i, obs in enumerate(observations):
-        area = obs.get("area", "Unknown")
-        desc = obs.get("description", "")
-        issue_type = obs.get("issue_type", "")
-        cluster = obs.get("cluster_id", "")
-        urgency = obs.get("urgency_score", "")
-        line = f"[{i}] Area: {area}. Issue type: {issue_type}. Description: {desc}. Cluster: {cluster}. Urgency: {urgency}."
-        lines.append(line)
-    if temperature_analysis and temperature_analysis.get("readings"):
-        lines.append("Temperature deltas (vs reference):")
-        ref = temperature_analysis.get("reference_value")
-        ref_u = temperature_analysis.get("reference_unit", "")
-        lines.append(f"  Reference: {ref} {ref_u}")
-        for r in temperature_analysis["readings"]:
-            loc = r.get("location", "")
-            delta = r.get("delta")
-            anomaly = " (ANOMALY)" if r.get("anomaly") else ""
-            lines.append(f"  - {loc}: delta {delta} {ref_u}{anomaly}")
-    return "\n".join(lines)
+    obs_lines = [
+        f"[{i}] Area: {obs.get('area', 'Unknown')}. Issue type: {obs.get('issue_type', '')}. "
+        f"Description: {obs.get('description', '')}. Cluster: {obs.get('cluster_id', '')}. "
+        f"Urgency: {obs.get('urgency_score', '')}."
+        for i, obs in enumerate(observations)
+    ]
+    if not (temperature_analysis and temperature_analysis.get("readings")):
+        return "\n".join(obs_lines)
+    ref = temperature_analysis.get("reference_value")
+    ref_u = temperature_analysis.get("reference_unit", "")
+    temp_lines = (
+        f"  - {r.get('location', '')}: delta {r.get('delta')} {ref_u}{' (ANOMALY)' if r.get('anomaly') else ''}"
+        for r in temperature_analysis["readings"]
+    )
+    return "\n".join(chain(
+        obs_lines,
+        ("Temperature deltas (vs reference):", f"  Reference: {ref} {ref_u}"),
+        temp_lines,
+    ))
 
 
 def _load_prompt(summary: str) -> str:
     """Load and fill root_cause prompt."""
-    prompts_dir = Path(__file__).resolve().parent.parent / "prompts"
-    with open(prompts_dir / "root_cause.yaml") as f:
-        data = yaml.safe_load(f)
-    return data["root_cause"].format(summary=summary)
+    return load_prompt_file("root_cause")["root_cause"].format(summary=summary)
 
 
 def _parse_inferences(response: str) -> list[dict[str, Any]]:
     """Parse JSON inferences from LLM response."""
-    text = response.strip()
-    match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text)
-    if match:
-        text = match.group(1)
-    data = json.loads(text)
-    return data.get("inferences", [])
+    return extract_json_from_response(response).get("inferences", [])
 
 
 def infer_root_causes(
@@ -64,7 +55,7 @@ def infer_root_causes(
     if not observations:
         return []
 
-    from .llm import call_llm
+    from .llm import call_llm, invalidate_cache
 
     summary = _build_summary(observations, temperature_analysis)
     prompt = _load_prompt(summary)
@@ -73,6 +64,8 @@ def infer_root_causes(
     try:
         inferences = _parse_inferences(response)
     except (json.JSONDecodeError, KeyError):
+        # Unparseable answer: don't serve it again from the response cache on retry
+        invalidate_cache(prompt, model=model)
         inferences = []
 
     # Build index -> inference map
@@ -80,12 +73,9 @@ def infer_root_causes(
 
     result = []
     for i, obs in enumerate(observations):
-        obs = dict(obs)
         inf = by_index.get(i, {})
         rc = inf.get("root_cause") or "Insufficient diagnostic detail available to determine root cause. Further inspection recommended."
         if "not determinable" in (rc or "").lower() or rc == "Not determinable from data":
             rc = "Insufficient diagnostic detail available to determine root cause. Further inspection recommended."
-        obs["root_cause"] = rc
-        obs["evidence"] = inf.get("evidence") or []
-        result.append(obs)
+        result.append({**obs, "root_cause": rc, "evidence": inf.get("evidence") or []})
     return result
@@ -1,51 +1,92 @@
 """Temperature delta calculation and anomaly detection for merged readings."""
 
 import re
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
+
 # Default threshold (°C) above which |delta| is flagged as anomaly
 DEFAULT_ANOMALY_THRESHOLD_C = 5.0
 
+# Whole value in one match: a range "22-24" / "22–24" (groups 1, 2) or a single number (group 3),
+# optionally followed by a degree suffix like "°C"
+_VALUE_RE = re.compile(
+    r"^\s*(?:(-?\d*\.?\d+)\s*[–\-]\s*(-?\d*\.?\d+)|(-?\d+\.?\d*))\s*(?:°[CFcf]?)?\s*$"
+)
+# Fallback for free-form values such as "approx 22.5"
+_NUM = re.compile(r"-?\d+\.?\d*")
+
+# Batches at least this large use the Numba-compiled conversion (when numba is installed);
+# below it the one-off JIT compile costs more than it saves
+NUMBA_MIN_READINGS = 10_000
+
 
 def _parse_value(raw: Any) -> float | None:
     """Parse numeric value from string; handle '23.5', '23.5°C', '22–24' (midpoint)."""
     if raw is None:
         return None
-    s = str(raw).strip()
-    if not s:
-        return None
-    # Remove degree symbols and trailing unit letters
-    s = re.sub(r"°[CFcf]?\s*$", "", s)
-    s = s.strip()
-    # Range like "22-24" or "22–24"
-    range_match = re.search(r"^(-?\d*\.?\d+)\s*[–\-]\s*(-?\d*\.?\d+)$", s)
-    if range_match:
-        lo = float(range_match.group(1))
-        hi = float(range_match.group(2))
-        return (lo + hi) / 2.0
-    # Single number
-    num_match = re.search(r"-?\d+\.?\d*", s)
+    s = str(raw)
+    m = _VALUE_RE.match(s)
+    if m:
+        if m.group(3) is not None:
+            return float(m.group(3))
+        return (float(m.group(1)) + float(m.group(2))) / 2.0
+    # Anything else: first number found, if any
+    num_match = _NUM.search(s)
     if num_match:
         return float(num_match.group(0))
     return None
 
 
-def _normalize_to_celsius(value: float, unit: str) -> float:
-    """Convert value to Celsius for consistent delta calculation."""
+def _is_fahrenheit(unit: str) -> bool:
+    """True if the unit string denotes Fahrenheit ("°F", "F", "Fahrenheit", ...)."""
     u = (unit or "").strip().upper().replace("°", "")
-    if "F" in u or "FAHRENHEIT" in u:
-        return (value - 32.0) * 5.0 / 9.0
-    return value
+    return "F" in u or "FAHRENHEIT" in u
 
 
 def _celsius_to_original(value_c: float, unit: str) -> float:
     """Convert Celsius back to original unit for delta display."""
-    u = (unit or "").strip().upper().replace("°", "")
-    if "F" in u or "FAHRENHEIT" in u:
+    if _is_fahrenheit(unit):
         return value_c * 9.0 / 5.0 + 32.0
     return value_c
 
 
+def _normalize_batch_numpy(values: np.ndarray, is_fahrenheit: np.ndarray) -> np.ndarray:
+    """Convert an array of readings to Celsius where the matching flag marks Fahrenheit."""
+    return np.where(is_fahrenheit, (values - 32.0) * 5.0 / 9.0, values)
+
+
+@lru_cache(maxsize=1)
+def _normalize_batch_numba():
+    """
+    Build the Numba-compiled Celsius conversion on first use (None if numba is not installed).
+    Importing numba is slow, so this only happens once a batch reaches NUMBA_MIN_READINGS.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def normalize(values, is_fahrenheit):
+        out = np.empty_like(values)
+        for i in range(values.size):
+            out[i] = (values[i] - 32.0) * 5.0 / 9.0 if is_fahrenheit[i] else values[i]
+        return out
+
+    return normalize
+
+
+def _normalize_batch(values: np.ndarray, is_fahrenheit: np.ndarray) -> np.ndarray:
+    """Celsius conversion for a whole batch; Numba loop for large batches, NumPy otherwise."""
+    if values.size >= NUMBA_MIN_READINGS:
+        normalize = _normalize_batch_numba()
+        if normalize is not None:
+            return normalize(values, is_fahrenheit)
+    return _normalize_batch_numpy(values, is_fahrenheit)
+
+
 def compute_temperature_analysis(
     temperatures: list[dict[str, Any]],
     anomaly_threshold_c: float = DEFAULT_ANOMALY_THRESHOLD_C,
@@ -63,55 +104,57 @@ def compute_temperature_analysis(
 
     # Parse and normalize to Celsius for comparison
     parsed: list[dict[str, Any]] = []
-    values_c: list[float] = []
     for t in temperatures:
-        loc = t.get("location", "")
-        unit = (t.get("unit") or "°C").strip() or "°C"
         val = _parse_value(t.get("value"))
         if val is None:
             continue
-        val_c = _normalize_to_celsius(val, unit)
+        unit = (t.get("unit") or "°C").strip() or "°C"
         parsed.append({
-            "location": loc,
+            "location": t.get("location", ""),
             "value": val,
             "unit": unit,
-            "value_c": val_c,
+            "is_f": _is_fahrenheit(unit),
         })
-        values_c.append(val_c)
 
-    if not values_c:
+    if not parsed:
         return {
             "reference_value": None,
             "reference_unit": None,
             "readings": [],
         }
 
+    # Reference, deltas and anomaly flags computed over whole arrays
+    n = len(parsed)
+    values = np.fromiter((p["value"] for p in parsed), dtype=np.float64, count=n)
+    is_f = np.fromiter((p["is_f"] for p in parsed), dtype=np.bool_, count=n)
+    values_c = _normalize_batch(values, is_f)
     # Reference = median (robust to outliers)
-    values_sorted = sorted(values_c)
-    n = len(values_sorted)
-    if n % 2 == 1:
-        reference_c = values_sorted[n // 2]
-    else:
-        reference_c = (values_sorted[n // 2 - 1] + values_sorted[n // 2]) / 2.0
+    reference_c = float(np.median(values_c))
+    deltas_c = values_c - reference_c
+    # Delta in each reading's own unit: a Fahrenheit degree is 5/9 of a Celsius degree
+    deltas = np.where(is_f, deltas_c * 9.0 / 5.0, deltas_c)
+    anomalies = np.abs(deltas_c) > anomaly_threshold_c
 
     # Use first reading's unit for reference display
-    first_unit = parsed[0]["unit"] if parsed else "°C"
+    first_unit = parsed[0]["unit"]
     reference_value = _celsius_to_original(reference_c, first_unit)
 
-    readings: list[dict[str, Any]] = []
-    for p in parsed:
-        delta_c = p["value_c"] - reference_c
-        unit = p["unit"]
-        delta_display = _celsius_to_original(reference_c + delta_c, unit) - _celsius_to_original(reference_c, unit)
-        anomaly = abs(delta_c) > anomaly_threshold_c
-        readings.append({
+    readings = [
+        {
             "location": p["location"],
             "value": p["value"],
-            "unit": unit,
-            "delta": round(delta_display, 2),
-            "delta_c": round(delta_c, 2),
+            "unit": p["unit"],
+            "delta": delta,
+            "delta_c": delta_c,
             "anomaly": anomaly,
-        })
+        }
+        for p, delta, delta_c, anomaly in zip(
+            parsed,
+            np.round(deltas, 2).tolist(),
+            np.round(deltas_c, 2).tolist(),
+            anomalies.tolist(),
+        )
+    ]
 
     return {
         "reference_value": round(reference_value, 2),
@@ -1,5 +1,6 @@
 """Urgency scoring (1–5) and reason per observation based on severity, issue type, and thermal anomalies."""
 
+import re
 from typing import Any
 
 # Severity keywords -> base score boost (added to issue-type base)
@@ -39,22 +40,53 @@ ISSUE_TYPE_SCORE: dict[str, int] = {
 }
 
 
+# (keyword, value) tables sorted longest keyword first (stable, so ties keep declaration order)
+_SEVERITY_TABLE: tuple[tuple[str, int], ...] = tuple(
+    sorted(SEVERITY_KEYWORDS.items(), key=lambda kv: -len(kv[0]))
+)
+_ISSUE_TABLE: tuple[tuple[str, int], ...] = tuple(
+    sorted(ISSUE_TYPE_SCORE.items(), key=lambda kv: -len(kv[0]))
+)
+
+
+def _keyword_pattern(table: tuple[tuple[str, int], ...]) -> re.Pattern[str]:
+    """One alternation over the table's keywords in order, in a lookahead so overlapping hits are all found."""
+    alternation = "|".join(re.escape(kw) for kw, _ in table)
+    return re.compile(f"(?=({alternation}))")
+
+
+# Longest-first alternation: where keywords start at the same position, the longer one wins
+_SEVERITY_RE = _keyword_pattern(_SEVERITY_TABLE)
+_ISSUE_RE = _keyword_pattern(_ISSUE_TABLE)
+_WORD_RE = re.compile(r"\w+")
+# When several issue keywords occur, the one listed first in ISSUE_TYPE_SCORE wins
+_ISSUE_RANK = {kw: i for i, kw in enumerate(ISSUE_TYPE_SCORE)}
+
+
 def _normalize(s: str) -> str:
     return (s or "").strip().lower()
 
 
-def _observation_urgency_from_severity(obs: dict[str, Any], severity_mentions: list[str]) -> int:
-    """Score 0–2 from severity keywords in description or global severity_mentions."""
-    desc = _normalize(obs.get("description", ""))
+def _severity_boost(text: str) -> int:
+    """Highest severity boost among keywords in text (0 if none)."""
+    return max((SEVERITY_KEYWORDS[kw] for kw in _SEVERITY_RE.findall(text)), default=0)
+
+
+def _mentions_severity(severity_mentions: list[str]) -> int:
+    """Severity boost from the report-wide severity_mentions (computed once per report)."""
     score = 0
-    for kw, boost in SEVERITY_KEYWORDS.items():
-        if kw in desc:
-            score = max(score, boost)
     for s in severity_mentions:
-        s = _normalize(s)
-        for kw, boost in SEVERITY_KEYWORDS.items():
-            if kw in s:
-                score = max(score, boost)
+        if score >= 2:
+            break  # already at the cap; further mentions cannot raise it
+        score = max(score, _severity_boost(_normalize(s)))
+    return score
+
+
+def _observation_urgency_from_severity(obs: dict[str, Any], mentions_score: int) -> int:
+    """Score 0–2 from severity keywords in description or global severity_mentions."""
+    score = mentions_score
+    if score < 2:
+        score = max(score, _severity_boost(_normalize(obs.get("description", ""))))
     return min(2, max(0, score))
 
 
@@ -62,33 +94,39 @@ def _observation_urgency_from_issue_type(obs: dict[str, Any]) -> int:
     """Base urgency 1–5 from issue_type or description keywords."""
     it = _normalize(obs.get("issue_type", ""))
     desc = _normalize(obs.get("description", ""))[:100]
-    text = f"{it} {desc}"
-    for keyword, base in ISSUE_TYPE_SCORE.items():
-        if keyword in text:
-            return base
+    found = _ISSUE_RE.findall(f"{it} {desc}")
+    if found:
+        return ISSUE_TYPE_SCORE[min(found, key=_ISSUE_RANK.__getitem__)]
     return 2  # default middle
 
 
-def _location_matches_reading(location: str, area: str) -> bool:
-    """True if temperature reading location likely matches observation area."""
-    loc = _normalize(location)
-    a = _normalize(area)
-    if not loc or not a:
+def _tokens(s: str) -> frozenset[str]:
+    """Lowercased word tokens of a location/area string."""
+    return frozenset(_WORD_RE.findall(_normalize(s)))
+
+
+def _location_matches_reading(loc_tokens: frozenset[str], area_tokens: frozenset[str]) -> bool:
+    """True if temperature reading location likely matches observation area (one names the other)."""
+    if not loc_tokens or not area_tokens:
         return False
-    return a in loc or loc in a
+    return area_tokens <= loc_tokens or loc_tokens <= area_tokens
 
 
-def _thermal_anomaly_boost(
-    obs: dict[str, Any],
-    temperature_analysis: dict[str, Any] | None,
-) -> int:
-    """Return 0 or 1 if observation area has a thermal anomaly."""
+def _anomaly_locations(temperature_analysis: dict[str, Any] | None) -> list[frozenset[str]]:
+    """Token sets of anomalous reading locations (computed once per report)."""
     if not temperature_analysis:
-        return 0
+        return []
     readings = temperature_analysis.get("readings") or []
-    area = _normalize(obs.get("area", ""))
-    for r in readings:
-        if r.get("anomaly") and _location_matches_reading(r.get("location", ""), area):
+    return [_tokens(r.get("location", "")) for r in readings if r.get("anomaly")]
+
+
+def _thermal_anomaly_boost(obs: dict[str, Any], anomaly_locations: list[frozenset[str]]) -> int:
+    """Return 0 or 1 if observation area has a thermal anomaly."""
+    if not anomaly_locations:
+        return 0
+    area_tokens = _tokens(obs.get("area", ""))
+    for loc_tokens in anomaly_locations:
+        if _location_matches_reading(loc_tokens, area_tokens):
             return 1
     return 0
 
@@ -102,12 +140,15 @@ def score_urgency(
     Set urgency_score (1–5) and urgency_reason on each observation.
     Returns new list of observations with fields added (does not mutate in place).
     """
+    # Report-wide inputs, prepared once rather than per observation
+    mentions_score = _mentions_severity(severity_mentions or [])
+    anomaly_locations = _anomaly_locations(temperature_analysis)
+
     result = []
     for obs in observations:
-        obs = dict(obs)
         base = _observation_urgency_from_issue_type(obs)
-        sev = _observation_urgency_from_severity(obs, severity_mentions or [])
-        thermal = _thermal_anomaly_boost(obs, temperature_analysis)
+        sev = _observation_urgency_from_severity(obs, mentions_score)
+        thermal = _thermal_anomaly_boost(obs, anomaly_locations)
         score = min(5, max(1, base + sev + thermal))
         reasons = []
         if sev > 0:
@@ -116,7 +157,9 @@ def score_urgency(
             reasons.append("thermal anomaly in area")
         if base >= 4:
             reasons.append("high-impact issue type")
-        obs["urgency_score"] = score
-        obs["urgency_reason"] = "; ".join(reasons) if reasons else "routine finding"
-        result.append(obs)
+        result.append({
+            **obs,
+            "urgency_score": score,
+            "urgency_reason": "; ".join(reasons) if reasons else "routine finding",
+        })
     return result